@@ -2,7 +2,7 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 from singleton_config import ConfigSingleton
 from factory_noticias import NoticiaFactory
-from datetime import datetime
+from datetime import datetime, timedelta
 from database import Database
 from firebase_service import FirebaseService
 from config import Config
@@ -44,8 +44,8 @@ def login():
             return jsonify({"error": "Usuario y contraseña requeridos"}), 400
         
         # Buscar usuario en MySQL
-        user = db.execute_query(
-            "SELECT idUsuario, usuario, contrasena, nombre, rol FROM usuarios_nul WHERE usuario = %s",
+        user = db.execute_statement(
+            'usuario_por_nombre',
             (usuario,),
             fetch_one=True
         )
@@ -73,14 +73,59 @@ def login():
         logger.error(traceback.format_exc())
         return jsonify({"error": "Error interno del servidor"}), 500
 
+# Límites por defecto del rango de fechas cuando solo se filtra por autor
+FECHA_MIN = datetime(1970, 1, 1)
+FECHA_MAX = datetime(9999, 12, 31)
+
+def parse_fecha(valor, fin=False):
+    """Convertir 'YYYY-MM' o 'YYYY-MM-DD' en datetime
+    
+    Con fin=True devuelve el inicio del periodo siguiente, para usar el valor
+    como límite exclusivo (hasta=2024-05 incluye todo mayo).
+    """
+    try:
+        fecha = datetime.strptime(valor, "%Y-%m")
+        if fin:
+            fecha = (fecha + timedelta(days=32)).replace(day=1)
+        return fecha
+    except ValueError:
+        pass
+    fecha = datetime.strptime(valor, "%Y-%m-%d")
+    if fin:
+        fecha += timedelta(days=1)
+    return fecha
+
 @app.route('/api/news', methods=['GET'])
 def get_news():
-    """Obtener todas las noticias desde MySQL"""
+    """Obtener noticias desde MySQL, opcionalmente filtradas por autor y fechas"""
+    autor = request.args.get("autor")
+    desde = request.args.get("desde")
+    hasta = request.args.get("hasta")
+    
     try:
-        noticias = db.execute_query(
-            "SELECT id, titulo, contenido, autor, fecha, imagen_url as imagen FROM noticias_nul ORDER BY fecha DESC",
-            fetch_all=True
-        )
+        desde = parse_fecha(desde) if desde else FECHA_MIN
+        hasta = parse_fecha(hasta, fin=True) if hasta else FECHA_MAX
+    except (ValueError, OverflowError):
+        return jsonify({"error": "Formato de fecha inválido, use YYYY-MM o YYYY-MM-DD"}), 400
+    
+    try:
+        if autor:
+            noticias = db.execute_statement(
+                'noticias_por_autor',
+                (autor, desde, hasta),
+                fetch_all=True
+            )
+        elif desde != FECHA_MIN or hasta != FECHA_MAX:
+            noticias = db.execute_statement(
+                'noticias_por_fecha',
+                (desde, hasta),
+                fetch_all=True
+            )
+        else:
+            noticias = db.execute_statement(
+                'noticias_listar',
+                fetch_all=True
+            )
         
         # Convertir fecha a string para JSON
         for noticia in noticias:
@@ -119,15 +164,19 @@ def create_news():
         if not titulo or not contenido or not autor:
             return jsonify({"error": "Faltan campos requeridos: titulo, contenido, autor"}), 400
         
-        # Insertar en MySQL
-        noticia_id = db.execute_query(
-            "INSERT INTO noticias_nul (titulo, contenido, autor, imagen_url) VALUES (%s, %s, %s, %s)",
-            (titulo, contenido, autor, imagen_url)
-        )
+        # Insertar en MySQL y actualizar el archivo en la misma transacción
+        with db.transaction():
+            noticia_id = db.execute_statement(
+                'noticia_insertar',
+                (titulo, contenido, autor, imagen_url),
+                commit=False
+            )
+            db.execute_statement('archivo_mes_incrementar', (noticia_id,), commit=False)
+            db.execute_statement('archivo_autor_incrementar', (noticia_id,), commit=False)
         
         # Obtener la noticia creada
-        nueva_noticia = db.execute_query(
-            "SELECT id, titulo, contenido, autor, fecha, imagen_url as imagen FROM noticias_nul WHERE id = %s",
+        nueva_noticia = db.execute_statement(
+            'noticia_por_id',
             (noticia_id,),
             fetch_one=True
         )
@@ -143,6 +192,21 @@ def create_news():
         logger.error(f"Error al crear noticia: {e}")
         return jsonify({"error": "Error al crear la noticia"}), 500
 
+@app.route('/api/news/archive', methods=['GET'])
+def get_news_archive():
+    """Obtener el número de noticias por mes y por autor"""
+    try:
+        por_mes = db.execute_statement('archivo_por_mes', fetch_all=True)
+        por_autor = db.execute_statement('archivo_por_autor', fetch_all=True)
+        
+        return jsonify({
+            "por_mes": por_mes or [],
+            "por_autor": por_autor or []
+        })
+    except Exception as e:
+        logger.error(f"Error al obtener archivo de noticias: {e}")
+        return jsonify({"error": "Error al obtener el archivo de noticias"}), 500
+
 @app.route('/api/config')
 def get_config():
     config = ConfigSingleton()
@@ -0,0 +1,135 @@
+"""
+Script para comparar execute_query (SQL de texto) con execute_statement
+(sentencias preparadas cacheadas) sobre la base de datos configurada
+"""
+import sys
+import os
+import time
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    sys.stdout.reconfigure(encoding='utf-8') if hasattr(sys.stdout, 'reconfigure') else None
+
+from mysql.connector import Error
+from database import Database, STATEMENTS
+
+ITERACIONES = int(os.getenv('BENCHMARK_ITERACIONES', 500))
+
+# Tiempo acumulado (picosegundos) de todas las sentencias de esta sesión.
+# SUM_CPU_TIME existe desde MySQL 8.0.28; si falta se usa solo SUM_TIMER_WAIT
+QUERY_TIEMPOS_SERVIDOR = (
+    "SELECT SUM(SUM_TIMER_WAIT) AS espera, {cpu} AS cpu "
+    "FROM performance_schema.events_statements_summary_by_thread_by_event_name "
+    "WHERE THREAD_ID = PS_CURRENT_THREAD_ID()"
+)
+
+def server_counters(db):
+    """Leer contadores de sesión del servidor (parseos y ejecuciones)"""
+    rows = db.execute_query(
+        "SHOW SESSION STATUS WHERE Variable_name IN "
+        "('Com_select', 'Com_stmt_prepare', 'Com_stmt_execute', 'Questions')",
+        fetch_all=True
+    )
+    return {row['Variable_name']: int(row['Value']) for row in rows}
+
+def server_times(db):
+    """Leer tiempo total y CPU del servidor consumidos por esta sesión
+    
+    Devuelve (espera, cpu) en picosegundos; cpu es None si la versión de
+    MySQL no lo registra y ambos son None sin performance_schema.
+    """
+    for cpu in ("SUM(SUM_CPU_TIME)", "NULL"):
+        try:
+            row = db.execute_query(QUERY_TIEMPOS_SERVIDOR.format(cpu=cpu), fetch_one=True)
+            espera = int(row['espera']) if row['espera'] is not None else None
+            cpu_total = int(row['cpu']) if row['cpu'] is not None else None
+            return espera, cpu_total
+        except Error:
+            continue
+    return None, None
+
+def snapshot(db):
+    """Tomar contadores y tiempos del servidor en un mismo punto"""
+    return server_counters(db), server_times(db)
+
+def diferencia(antes, despues):
+    """Restar dos snapshots (los tiempos pueden ser None)"""
+    contadores = {k: despues[0][k] - antes[0][k] for k in despues[0]}
+    tiempos = tuple(
+        d - a if a is not None and d is not None else None
+        for a, d in zip(antes[1], despues[1])
+    )
+    return contadores, tiempos
+
+def medir_overhead(db):
+    """Medir lo que aportan las propias lecturas de snapshot, para descontarlo"""
+    return diferencia(snapshot(db), snapshot(db))
+
+def medir(db, nombre, ejecutar, overhead):
+    """Ejecutar una consulta ITERACIONES veces y mostrar tiempos y contadores"""
+    ejecutar()  # Calentamiento: abre la conexión y prepara la sentencia
+    antes = snapshot(db)
+    wall_inicio = time.perf_counter()
+    cpu_inicio = time.process_time()
+
+    for _ in range(ITERACIONES):
+        ejecutar()
+
+    cpu = time.process_time() - cpu_inicio
+    wall = time.perf_counter() - wall_inicio
+    contadores, tiempos = diferencia(antes, snapshot(db))
+    contadores_extra, tiempos_extra = overhead
+
+    print(f"\n[INFO] {nombre}")
+    print(f"  - Tiempo total por consulta: {wall / ITERACIONES * 1e6:.1f} us")
+    print(f"  - CPU cliente por consulta: {cpu / ITERACIONES * 1e6:.1f} us")
+
+    etiquetas = ("Tiempo servidor por consulta", "CPU servidor por consulta")
+    for etiqueta, valor, extra in zip(etiquetas, tiempos, tiempos_extra):
+        if valor is None or extra is None:
+            print(f"  - {etiqueta}: no disponible")
+        else:
+            # Picosegundos -> microsegundos
+            print(f"  - {etiqueta}: {(valor - extra) / ITERACIONES / 1e6:.1f} us")
+
+    for variable in sorted(contadores):
+        print(f"  - {variable}: {contadores[variable] - contadores_extra[variable]}")
+
+def benchmark():
+    """Comparar las rutas de ejecución para las consultas más frecuentes"""
+    print("=" * 60)
+    print(f"BENCHMARK DE CONSULTAS ({ITERACIONES} iteraciones)")
+    print("=" * 60)
+
+    db = Database()
+
+    try:
+        overhead = medir_overhead(db)
+
+        query_usuario = STATEMENTS['usuario_por_nombre']
+        medir(db, "Login - execute_query (texto)",
+              lambda: db.execute_query(query_usuario, ('admin',), fetch_one=True), overhead)
+        medir(db, "Login - execute_statement (dict)",
+              lambda: db.execute_statement('usuario_por_nombre', ('admin',), fetch_one=True), overhead)
+        medir(db, "Login - execute_statement (tupla)",
+              lambda: db.execute_statement('usuario_por_nombre', ('admin',), fetch_one=True, dictionary=False), overhead)
+
+        query_noticias = STATEMENTS['noticias_listar']
+        medir(db, "Noticias - execute_query (texto)",
+              lambda: db.execute_query(query_noticias, fetch_all=True), overhead)
+        medir(db, "Noticias - execute_statement (dict)",
+              lambda: db.execute_statement('noticias_listar', fetch_all=True), overhead)
+        medir(db, "Noticias - execute_statement (tupla)",
+              lambda: db.execute_statement('noticias_listar', fetch_all=True, dictionary=False), overhead)
+
+        print("\n[OK] Benchmark completado")
+        return True
+
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        return False
+    finally:
+        db.close_connection()
+
+if __name__ == "__main__":
+    success = benchmark()
+    sys.exit(0 if success else 1)
@@ -17,6 +17,8 @@ class Config:
     MYSQL_USER = os.getenv('MYSQL_USER', 'root')
     MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD', '')
     MYSQL_DATABASE = os.getenv('MYSQL_DATABASE', 'noticias_ul')
+    # Máximo de sentencias preparadas abiertas por conexión (LRU, 0 = sin caché)
+    MYSQL_STATEMENT_CACHE_SIZE = int(os.getenv('MYSQL_STATEMENT_CACHE_SIZE', 16))
     
     # Firebase
     FIREBASE_CREDENTIALS_PATH = os.getenv('FIREBASE_CREDENTIALS_PATH', 'firebase-credentials.json')
@@ -3,16 +3,76 @@ Módulo para manejar la conexión a MySQL
 """
 import mysql.connector
 from mysql.connector import Error
+from collections import OrderedDict
+from contextlib import contextmanager
 from config import Config
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Registro de sentencias con nombre que se ejecutan como prepared statements.
+# El conector solo reutiliza la sentencia preparada si recibe el mismo objeto
+# str en cada ejecución, por eso el texto vive aquí y no en cada llamada.
+STATEMENTS = {
+    'usuario_por_nombre': (
+        "SELECT idUsuario, usuario, contrasena, nombre, rol "
+        "FROM usuarios_nul WHERE usuario = %s"
+    ),
+    'noticias_listar': (
+        "SELECT id, titulo, contenido, autor, fecha, imagen_url as imagen "
+        "FROM noticias_nul ORDER BY fecha DESC"
+    ),
+    'noticia_insertar': (
+        "INSERT INTO noticias_nul (titulo, contenido, autor, imagen_url) "
+        "VALUES (%s, %s, %s, %s)"
+    ),
+    'noticia_por_id': (
+        "SELECT id, titulo, contenido, autor, fecha, imagen_url as imagen "
+        "FROM noticias_nul WHERE id = %s"
+    ),
+    # Filtros del listado: usan idx_autor_fecha e idx_fecha. El rango es [desde, hasta)
+    'noticias_por_autor': (
+        "SELECT id, titulo, contenido, autor, fecha, imagen_url as imagen "
+        "FROM noticias_nul WHERE autor = %s AND fecha >= %s AND fecha < %s "
+        "ORDER BY fecha DESC"
+    ),
+    'noticias_por_fecha': (
+        "SELECT id, titulo, contenido, autor, fecha, imagen_url as imagen "
+        "FROM noticias_nul WHERE fecha >= %s AND fecha < %s "
+        "ORDER BY fecha DESC"
+    ),
+    # Agregados del archivo, mantenidos al crear cada noticia. Mes y autor
+    # se leen de la fila insertada (por id) para no depender del cliente
+    'archivo_mes_incrementar': (
+        "INSERT INTO noticias_por_mes_nul (mes, total) "
+        "SELECT DATE_FORMAT(fecha, '%Y-%m'), 1 FROM noticias_nul WHERE id = %s "
+        "ON DUPLICATE KEY UPDATE total = total + 1"
+    ),
+    'archivo_autor_incrementar': (
+        "INSERT INTO noticias_por_autor_nul (autor, total) "
+        "SELECT autor, 1 FROM noticias_nul WHERE id = %s "
+        "ON DUPLICATE KEY UPDATE total = total + 1"
+    ),
+    'archivo_por_mes': (
+        "SELECT mes, total FROM noticias_por_mes_nul ORDER BY mes DESC"
+    ),
+    'archivo_por_autor': (
+        "SELECT autor, total FROM noticias_por_autor_nul ORDER BY total DESC, autor"
+    ),
+}
+
 class Database:
     """Clase singleton para manejar la conexión a MySQL"""
     
     _instance = None
     _connection = None
+    # Cursores preparados de la conexión actual: (nombre, dictionary) -> cursor
+    _statement_cache = None
+    # Flask atiende requests en varios hilos y la conexión y sus cursores
+    # preparados son compartidos: solo un hilo puede usarlos a la vez.
+    # Es reentrante para que transaction() pueda ejecutar sentencias
+    _lock = threading.RLock()
     
     def __new__(cls):
         if cls._instance is None:
@@ -31,6 +91,8 @@ class Database:
                     database=Config.MYSQL_DATABASE,
                     autocommit=True
                 )
+                # Las sentencias preparadas pertenecen a la conexión anterior
+                self._statement_cache = OrderedDict()
                 logger.info(f"✅ Conexión a MySQL establecida: {Config.MYSQL_DATABASE}")
             except Error as e:
                 logger.error(f"❌ Error al conectar a MySQL: {e}")
@@ -40,32 +102,137 @@ class Database:
     def close_connection(self):
         """Cerrar conexión a MySQL"""
         if self._connection and self._connection.is_connected():
+            self.clear_statement_cache()
             self._connection.close()
             logger.info("✅ Conexión a MySQL cerrada")
     
     def execute_query(self, query, params=None, fetch_one=False, fetch_all=False):
         """Ejecutar una consulta SQL"""
-        connection = self.get_connection()
-        cursor = connection.cursor(dictionary=True)
+        with self._lock:
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
+            
+            try:
+                cursor.execute(query, params or ())
+                
+                if fetch_one:
+                    result = cursor.fetchone()
+                elif fetch_all:
+                    result = cursor.fetchall()
+                else:
+                    result = cursor.lastrowid
+                
+                connection.commit()
+                return result
+            except Error as e:
+                logger.error(f"❌ Error al ejecutar consulta: {e}")
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def _get_prepared_cursor(self, connection, name, dictionary):
+        """Obtener el cursor preparado de una sentencia, aplicando LRU
+        
+        Con MYSQL_STATEMENT_CACHE_SIZE <= 0 no se cachea: se devuelve un
+        cursor nuevo que execute_statement cierra tras usarlo.
+        """
+        if Config.MYSQL_STATEMENT_CACHE_SIZE <= 0:
+            return connection.cursor(prepared=True, dictionary=dictionary)
         
+        key = (name, dictionary)
+        cursor = self._statement_cache.get(key)
+        if cursor is not None:
+            self._statement_cache.move_to_end(key)
+            return cursor
+        
+        cursor = connection.cursor(prepared=True, dictionary=dictionary)
+        self._statement_cache[key] = cursor
+        while len(self._statement_cache) > Config.MYSQL_STATEMENT_CACHE_SIZE:
+            _, old_cursor = self._statement_cache.popitem(last=False)
+            self._close_cursor(old_cursor)
+        return cursor
+    
+    def _close_cursor(self, cursor):
+        """Cerrar un cursor preparado (libera la sentencia en el servidor)"""
         try:
-            cursor.execute(query, params or ())
+            cursor.close()
+        except Exception as e:
+            # Con la extensión C, cerrar sobre una conexión caída lanza
+            # MySQLInterfaceError, que no hereda de mysql.connector.Error
+            logger.warning(f"No se pudo cerrar sentencia preparada: {e}")
+    
+    def clear_statement_cache(self):
+        """Liberar todas las sentencias preparadas de la conexión actual"""
+        with self._lock:
+            if not self._statement_cache:
+                return
+            for cursor in self._statement_cache.values():
+                self._close_cursor(cursor)
+            self._statement_cache.clear()
+    
+    def execute_statement(self, name, params=None, fetch_one=False, fetch_all=False,
+                          dictionary=True, commit=True):
+        """Ejecutar una sentencia registrada en STATEMENTS como prepared statement
+        
+        Con dictionary=False las filas se devuelven como tuplas, evitando
+        construir un dict por fila; por ahora solo lo usa benchmark_queries.py,
+        ya que las rutas de app.py necesitan dicts para jsonify.
+        Dentro de transaction() se usa commit=False.
+        """
+        with self._lock:
+            query = STATEMENTS[name]
+            connection = self.get_connection()
+            cursor = self._get_prepared_cursor(connection, name, dictionary)
+            cached = Config.MYSQL_STATEMENT_CACHE_SIZE > 0
+            
+            try:
+                cursor.execute(query, params or ())
             
-            if fetch_one:
-                result = cursor.fetchone()
-            elif fetch_all:
-                result = cursor.fetchall()
-            else:
-                result = cursor.lastrowid
+                if fetch_one or fetch_all:
+                    # Los cursores preparados no admiten buffered: se lee todo
+                    # el resultado para dejar el cursor listo para reutilizarse
+                    rows = cursor.fetchall()
+                    if fetch_one:
+                        result = rows[0] if rows else None
+                    else:
+                        result = rows
+                else:
+                    result = cursor.lastrowid
             
-            connection.commit()
-            return result
-        except Error as e:
-            logger.error(f"❌ Error al ejecutar consulta: {e}")
-            connection.rollback()
-            raise
-        finally:
-            cursor.close()
+                if commit:
+                    connection.commit()
+                return result
+            except Error as e:
+                logger.error(f"❌ Error al ejecutar sentencia '{name}': {e}")
+                # Descartar la sentencia por si quedó invalidada en el servidor
+                connection.rollback()
+                if cached:
+                    self._statement_cache.pop((name, dictionary), None)
+                    self._close_cursor(cursor)
+                raise
+            finally:
+                if not cached:
+                    self._close_cursor(cursor)
+    
+    @contextmanager
+    def transaction(self):
+        """Agrupar varias sentencias en una transacción
+        
+        Se confirma al salir del bloque y se hace rollback si algo falla.
+        Las sentencias del bloque deben ejecutarse con commit=False. El lock
+        se mantiene durante todo el bloque para que otro hilo no confirme ni
+        deshaga la transacción a medias sobre la conexión compartida.
+        """
+        with self._lock:
+            connection = self.get_connection()
+            connection.start_transaction()
+            try:
+                yield connection
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
     
     def init_tables(self):
         """Inicializar tablas en la base de datos"""
@@ -104,12 +271,59 @@ class Database:
                         imagen_url VARCHAR(500),
                         usuario_id INT,
                         INDEX idx_fecha (fecha),
-                        INDEX idx_autor (autor),
+                        INDEX idx_autor_fecha (autor, fecha),
                         INDEX idx_titulo (titulo)
                     )
                 """)
                 logger.info("Tabla noticias_nul creada")
             
+            # Migrar tablas existentes: (autor, fecha) sirve el filtro por autor
+            # y rango de fechas ya ordenado, y sustituye a idx_autor
+            try:
+                indices = {
+                    fila['nombre'] for fila in self.execute_query("""
+                        SELECT DISTINCT INDEX_NAME AS nombre FROM information_schema.statistics
+                        WHERE table_schema = DATABASE() AND table_name = 'noticias_nul'
+                    """, fetch_all=True)
+                }
+                if 'idx_autor_fecha' not in indices:
+                    alter = "ALTER TABLE noticias_nul ADD INDEX idx_autor_fecha (autor, fecha)"
+                    if 'idx_autor' in indices:
+                        alter += ", DROP INDEX idx_autor"
+                    self.execute_query(alter)
+                    logger.info("Índice idx_autor_fecha creado en noticias_nul")
+            except Exception as e:
+                logger.warning(f"No se pudo crear idx_autor_fecha: {e}")
+            
+            # Tablas de agregados para /api/news/archive
+            try:
+                self.execute_query("""
+                    CREATE TABLE IF NOT EXISTS noticias_por_mes_nul (
+                        mes CHAR(7) PRIMARY KEY,
+                        total INT NOT NULL DEFAULT 0
+                    )
+                """)
+                self.execute_query("""
+                    CREATE TABLE IF NOT EXISTS noticias_por_autor_nul (
+                        autor VARCHAR(100) PRIMARY KEY,
+                        total INT NOT NULL DEFAULT 0
+                    )
+                """)
+                # Recalcular al arrancar: puebla tablas nuevas y corrige cualquier
+                # desajuste. REPLACE permite repetirlo sin errores de clave duplicada
+                self.execute_query("""
+                    REPLACE INTO noticias_por_mes_nul (mes, total)
+                    SELECT DATE_FORMAT(fecha, '%Y-%m'), COUNT(*) FROM noticias_nul
+                    GROUP BY DATE_FORMAT(fecha, '%Y-%m')
+                """)
+                self.execute_query("""
+                    REPLACE INTO noticias_por_autor_nul (autor, total)
+                    SELECT autor, COUNT(*) FROM noticias_nul GROUP BY autor
+                """)
+                logger.info("Tablas de archivo de noticias actualizadas")
+            except Exception as e:
+                logger.warning(f"No se pudo actualizar el archivo de noticias: {e}")
+            
             # Insertar usuario admin por defecto si no existe
             try:
                 existing_admin = self.execute_query(
@@ -22,6 +22,7 @@ CREATE TABLE IF NOT EXISTS usuarios_nul (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Tabla de noticias_nul
+-- (en bases existentes, init_tables en database.py reemplaza idx_autor por idx_autor_fecha)
 CREATE TABLE IF NOT EXISTS noticias_nul (
     id INT AUTO_INCREMENT PRIMARY KEY,
     titulo VARCHAR(255) NOT NULL,
@@ -31,10 +32,21 @@ CREATE TABLE IF NOT EXISTS noticias_nul (
     imagen_url VARCHAR(500),
     usuario_id INT,
     INDEX idx_fecha (fecha),
-    INDEX idx_autor (autor),
+    INDEX idx_autor_fecha (autor, fecha),
     INDEX idx_titulo (titulo)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Agregados para /api/news/archive (los mantiene create_news en app.py)
+CREATE TABLE IF NOT EXISTS noticias_por_mes_nul (
+    mes CHAR(7) PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS noticias_por_autor_nul (
+    autor VARCHAR(100) PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Insertar usuario admin por defecto
 -- Password: '1234' (en producción usar hash bcrypt o similar)
 INSERT INTO usuarios_nul (usuario, contrasena, nombre, rol) 
@@ -46,3 +58,11 @@ INSERT INTO noticias_nul (titulo, contenido, autor, imagen_url) VALUES
 ('Bienvenido a Noticias Universitarias', 'Este es el sistema de noticias universitarias. Puedes agregar noticias, comentar y más.', 'Sistema', ''),
 ('Cómo usar el sistema', 'Para agregar noticias, debes iniciar sesión con tu cuenta de administrador.', 'Sistema', '')
 ON DUPLICATE KEY UPDATE titulo=titulo;
+
+-- Recalcular los agregados a partir de las noticias existentes
+REPLACE INTO noticias_por_mes_nul (mes, total)
+SELECT DATE_FORMAT(fecha, '%Y-%m'), COUNT(*) FROM noticias_nul
+GROUP BY DATE_FORMAT(fecha, '%Y-%m');
+
+REPLACE INTO noticias_por_autor_nul (autor, total)
+SELECT autor, COUNT(*) FROM noticias_nul GROUP BY autor;
@@ -0,0 +1,129 @@
+"""
+Script para probar los filtros de /api/news y el archivo de noticias
+"""
+import sys
+import os
+from datetime import datetime, timedelta
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    sys.stdout.reconfigure(encoding='utf-8') if hasattr(sys.stdout, 'reconfigure') else None
+
+from app import app, db, parse_fecha
+
+errores = []
+
+def verificar(condicion, mensaje):
+    """Mostrar el resultado de una comprobación y registrar los fallos"""
+    if condicion:
+        print(f"[OK] {mensaje}")
+    else:
+        print(f"[ERROR] {mensaje}")
+        errores.append(mensaje)
+
+def ids_filtrados(client, **filtros):
+    """IDs devueltos por GET /api/news con los filtros indicados"""
+    return {n['id'] for n in client.get('/api/news', query_string=filtros).get_json()}
+
+def archivo_coincide(client):
+    """Comparar /api/news/archive con un GROUP BY sobre noticias_nul"""
+    archivo = client.get('/api/news/archive').get_json()
+    por_mes = {f['mes']: f['total'] for f in archivo['por_mes']}
+    por_autor = {f['autor']: f['total'] for f in archivo['por_autor']}
+
+    esperado_mes = {
+        f['mes']: f['total'] for f in db.execute_query(
+            "SELECT DATE_FORMAT(fecha, '%Y-%m') AS mes, COUNT(*) AS total "
+            "FROM noticias_nul GROUP BY mes",
+            fetch_all=True
+        )
+    }
+    esperado_autor = {
+        f['autor']: f['total'] for f in db.execute_query(
+            "SELECT autor, COUNT(*) AS total FROM noticias_nul GROUP BY autor",
+            fetch_all=True
+        )
+    }
+    return por_mes == esperado_mes and por_autor == esperado_autor
+
+def probar_parse_fecha():
+    """Probar los límites de fechas (hasta es inclusivo)"""
+    print("\n[INFO] parse_fecha")
+    verificar(parse_fecha("2024-05") == datetime(2024, 5, 1), "desde=YYYY-MM empieza el día 1")
+    verificar(parse_fecha("2024-05", fin=True) == datetime(2024, 6, 1), "hasta=YYYY-MM incluye todo el mes")
+    verificar(parse_fecha("2024-12", fin=True) == datetime(2025, 1, 1), "hasta=YYYY-12 pasa al año siguiente")
+    verificar(parse_fecha("2024-05-31", fin=True) == datetime(2024, 6, 1), "hasta=YYYY-MM-DD incluye todo el día")
+
+def probar_fechas_invalidas(client):
+    """Probar que las fechas inválidas devuelven 400"""
+    print("\n[INFO] Fechas inválidas")
+    for filtros in ({"desde": "ayer"}, {"hasta": "2024-13"}, {"hasta": "9999-12"}):
+        respuesta = client.get('/api/news', query_string=filtros)
+        verificar(respuesta.status_code == 400, f"{filtros} -> {respuesta.status_code}")
+
+def probar_filtros_y_archivo(client):
+    """Crear una noticia y comprobar filtros y agregados antes y después de reiniciar"""
+    print("\n[INFO] Filtros y archivo")
+    autor = f"test_archivo_{datetime.now():%Y%m%d%H%M%S%f}"
+    respuesta = client.post('/api/news', json={
+        "titulo": "Noticia de prueba",
+        "contenido": "Creada por test_news_archive.py",
+        "autor": autor
+    })
+    verificar(respuesta.status_code == 201, "create_news devuelve 201")
+    if respuesta.status_code != 201:
+        return
+
+    noticia = respuesta.get_json()['noticia']
+    fecha = datetime.strptime(noticia['fecha'], "%Y-%m-%d %H:%M:%S")
+    dia = fecha.strftime("%Y-%m-%d")
+    dia_anterior = (fecha - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    try:
+        verificar(noticia['id'] in ids_filtrados(client, autor=autor), "filtro por autor")
+        verificar(noticia['id'] in ids_filtrados(client, autor=autor, hasta=fecha.strftime("%Y-%m")),
+                  "hasta=YYYY-MM incluye la noticia del mes")
+        verificar(noticia['id'] in ids_filtrados(client, autor=autor, desde=dia, hasta=dia),
+                  "desde=hasta=YYYY-MM-DD incluye la noticia del día")
+        verificar(noticia['id'] not in ids_filtrados(client, autor=autor, hasta=dia_anterior),
+                  "hasta del día anterior la excluye")
+        verificar(noticia['id'] in ids_filtrados(client, desde=dia, hasta=dia),
+                  "filtro solo por fechas")
+
+        verificar(archivo_coincide(client), "archivo coincide con GROUP BY tras create_news")
+        verificar(db.init_tables(), "init_tables se puede repetir (reinicio)")
+        verificar(archivo_coincide(client), "archivo coincide con GROUP BY tras reiniciar")
+    finally:
+        # Borrar la noticia de prueba y descontarla del archivo
+        db.execute_query("DELETE FROM noticias_nul WHERE id = %s", (noticia['id'],))
+        db.execute_query(
+            "UPDATE noticias_por_mes_nul SET total = total - 1 WHERE mes = %s",
+            (fecha.strftime("%Y-%m"),)
+        )
+        db.execute_query("DELETE FROM noticias_por_mes_nul WHERE total <= 0")
+        db.execute_query("DELETE FROM noticias_por_autor_nul WHERE autor = %s", (autor,))
+
+def test_news_archive():
+    """Ejecutar todas las comprobaciones"""
+    print("=" * 60)
+    print("PRUEBA DE FILTROS Y ARCHIVO DE NOTICIAS")
+    print("=" * 60)
+
+    client = app.test_client()
+
+    try:
+        probar_parse_fecha()
+        probar_fechas_invalidas(client)
+        probar_filtros_y_archivo(client)
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        return False
+
+    if errores:
+        print(f"\n[ERROR] {len(errores)} comprobaciones fallaron")
+        return False
+    print("\n[OK] Todas las comprobaciones pasaron!")
+    return True
+
+if __name__ == "__main__":
+    success = test_news_archive()
+    sys.exit(0 if success else 1)